@@ -17,6 +17,10 @@ Captures monophonic input MIDI sequences and plays back responses from the
 sequence generator.
 """
 
+from __future__ import print_function
+
+from multiprocessing.pool import ThreadPool
+import signal
 import time
 
 # internal imports
@@ -26,6 +30,8 @@ import magenta
 from magenta.interfaces.midi import midi_hub
 from magenta.interfaces.midi import midi_interaction
 from magenta.models.melody_rnn import melody_rnn_sequence_generator
+from magenta.protobuf import generator_pb2
+from magenta.protobuf import music_pb2
 
 FLAGS = tf.app.flags.FLAGS
 
@@ -75,6 +81,12 @@ tf.app.flags.DEFINE_integer(
     'The control number to use for selecting between generators when multiple '
     'bundle files are specified. Required unless only a single bundle file is '
     'specified.')
+tf.app.flags.DEFINE_bool(
+    'warmup',
+    True,
+    'Whether to run a throwaway generation with each generator before the '
+    'interaction starts, so that the first response does not pay one-time '
+    'TensorFlow initialization costs.')
 tf.app.flags.DEFINE_string(
     'log', 'WARN',
     'The threshold for what messages will be logged. DEBUG, INFO, WARN, ERROR, '
@@ -84,25 +96,30 @@ tf.app.flags.DEFINE_string(
 _GENERATOR_MAP = melody_rnn_sequence_generator.get_generator_map()
 
 
-def _validate_flags():
-  """Returns True if flag values are valid or prints error and returns False."""
+def _validate_flags(bundle_files):
+  """Returns True if flag values are valid or prints error and returns False.
+
+  Args:
+    bundle_files: A tuple of the bundle file paths parsed from `--bundle_files`,
+        or None if the flag was not specified.
+  """
   if FLAGS.list_ports:
-    print "Input ports: '%s'" % (
-        "', '".join(midi_hub.get_available_input_ports()))
-    print "Ouput ports: '%s'" % (
-        "', '".join(midi_hub.get_available_output_ports()))
+    print("Input ports: '%s'" % (
+        "', '".join(midi_hub.get_available_input_ports())))
+    print("Ouput ports: '%s'" % (
+        "', '".join(midi_hub.get_available_output_ports())))
     return False
 
-  if FLAGS.bundle_files is None:
-    print '--bundle_files must be specified.'
+  if bundle_files is None:
+    print('--bundle_files must be specified.')
     return False
 
-  if (FLAGS.end_call_control_number, FLAGS.phrase_bars).count(None) != 1:
+  if (FLAGS.end_call_control_number is None) == (FLAGS.phrase_bars is None):
     print('Exactly one of --end_call_control_number or --phrase_bars should be '
           'specified.')
     return False
 
-  if (len(FLAGS.bundle_files.split(',')) > 1 and
+  if (len(bundle_files) > 1 and
       FLAGS.generator_select_control_number is None):
     print('If specifiying multiple bundle files (generators), '
           '--generator_select_control_number must be specified.')
@@ -112,73 +129,119 @@ def _validate_flags():
 
 
 def _load_generator_from_bundle_file(bundle_file):
-  """Returns initialized generator from bundle file path or None if fails."""
+  """Returns initialized generator from bundle file path or None if fails.
+
+  May be called from worker threads, so failures are reported through
+  `tf.logging` rather than printed.
+  """
   try:
     bundle = magenta.music.sequence_generator_bundle.read_bundle_file(
         bundle_file)
   except magenta.music.sequence_generator_bundle.GeneratorBundleParseException:
-    print 'Failed to parse bundle file: %s' % FLAGS.bundle_file
+    tf.logging.error('Failed to parse bundle file: %s', bundle_file)
     return None
 
   generator_id = bundle.generator_details.id
   if generator_id not in _GENERATOR_MAP:
-    print "Unrecognized SequenceGenerator ID '%s' in bundle file: %s" % (
-        generator_id, FLAGS.bundle_file)
+    tf.logging.error(
+        "Unrecognized SequenceGenerator ID '%s' in bundle file: %s",
+        generator_id, bundle_file)
     return None
 
   generator = _GENERATOR_MAP[generator_id](checkpoint=None, bundle=bundle)
   generator.initialize()
-  print "Loaded '%s' generator bundle from file '%s'." % (
-      bundle.generator_details.id, bundle_file)
+  tf.logging.info("Loaded '%s' generator bundle from file '%s'.",
+                  bundle.generator_details.id, bundle_file)
   return generator
 
 
+def _warm_up_generators(generators):
+  """Runs a throwaway generation with each generator.
+
+  Generates a single phrase from an empty primer so that lazy TensorFlow
+  initialization completes before the first real response is requested.
+
+  Args:
+    generators: A collection of initialized SequenceGenerator objects.
+  """
+  seconds_per_bar = 4 * 60.0 / FLAGS.qpm
+  phrase_bars = FLAGS.phrase_bars if FLAGS.phrase_bars is not None else 1
+
+  primer_sequence = music_pb2.NoteSequence()
+  primer_sequence.tempos.add(qpm=FLAGS.qpm)
+  generator_options = generator_pb2.GeneratorOptions()
+  # Start after the first bar since generators can only extend sequences.
+  generator_options.generate_sections.add(
+      start_time=seconds_per_bar,
+      end_time=(phrase_bars + 1) * seconds_per_bar)
+
+  for generator in generators:
+    tf.logging.info("Warming up '%s' generator.", generator.details.id)
+    generator.generate(primer_sequence, generator_options)
+
+
 def _print_instructions():
   """Prints instructions for interaction based on the flag values."""
-  print ''
-  print 'Instructions:'
+  print()
+  print('Instructions:')
   if FLAGS.start_call_control_number is not None:
-    print ('When you want to begin the call phrase, signal control number %d '
-           'with value 0.' % FLAGS.start_call_control_number)
-  print 'Play when you hear the metronome ticking.'
+    print('When you want to begin the call phrase, signal control number %d '
+          'with value 0.' % FLAGS.start_call_control_number)
+  print('Play when you hear the metronome ticking.')
   if FLAGS.phrase_bars is not None:
-    print ('After %d bars (4 beats), Magenta will play its response.' %
-           FLAGS.phrase_bars)
+    print('After %d bars (4 beats), Magenta will play its response.' %
+          FLAGS.phrase_bars)
   else:
-    print ('When you want to end the call phrase, signal control number %d '
-           'with value 0' % FLAGS.end_call_control_number)
-    print ('At the end of the current bar (4 beats), Magenta will play its '
-           'response.')
+    print('When you want to end the call phrase, signal control number %d '
+          'with value 0' % FLAGS.end_call_control_number)
+    print('At the end of the current bar (4 beats), Magenta will play its '
+          'response.')
   if FLAGS.start_call_control_number is not None:
-    print ('Once the response completes, the interface will wait for you to '
-           'signal a new call phrase using control number %d.' %
-           FLAGS.start_call_control_number)
+    print('Once the response completes, the interface will wait for you to '
+          'signal a new call phrase using control number %d.' %
+          FLAGS.start_call_control_number)
   else:
-    print ('Once the response completes, the metronome will tick and you can '
-           'play again.')
+    print('Once the response completes, the metronome will tick and you can '
+          'play again.')
 
-  print ''
-  print 'To end the interaction, press CTRL-C.'
+  print()
+  print('To end the interaction, press CTRL-C.')
 
 
 def main(unused_argv):
   tf.logging.set_verbosity(FLAGS.log)
 
-  if not _validate_flags():
+  bundle_files = (
+      None if FLAGS.bundle_files is None else
+      tuple(bundle_file.strip()
+            for bundle_file in FLAGS.bundle_files.split(',')))
+
+  if not _validate_flags(bundle_files):
+    return
+
+  # Load generators. Each bundle is parsed and its TF graph restored in a
+  # separate thread so that startup time is bounded by the slowest bundle
+  # rather than the sum of all of them. This relies on `_GENERATOR_MAP`
+  # creating a separate model for every generator, so that no two threads
+  # initialize the same TF session.
+  pool = ThreadPool(len(bundle_files))
+  try:
+    generators = pool.map(_load_generator_from_bundle_file, bundle_files)
+  finally:
+    pool.close()
+    pool.join()
+  if any(generator is None for generator in generators):
     return
 
-  # Load generators.
-  generators = []
-  for bundle_file in FLAGS.bundle_files.split(','):
-    generators.append(_load_generator_from_bundle_file(bundle_file))
-    if generators[-1] is None:
-      return
+  if FLAGS.warmup:
+    _warm_up_generators(generators)
 
   # Initialize MidiHub.
   if FLAGS.input_port not in midi_hub.get_available_input_ports():
-    print "Opening '%s' as a virtual MIDI port for input." % FLAGS.input_port
+    print("Opening '%s' as a virtual MIDI port for input." % FLAGS.input_port)
   if FLAGS.output_port not in midi_hub.get_available_output_ports():
-    print "Opening '%s' as a virtual MIDI port for output." % FLAGS.output_port
+    print("Opening '%s' as a virtual MIDI port for output." %
+          FLAGS.output_port)
   hub = midi_hub.MidiHub(FLAGS.input_port, FLAGS.output_port,
                          midi_hub.TextureType.MONOPHONIC)
 
@@ -202,12 +265,18 @@ def main(unused_argv):
 
   interaction.start()
   try:
+    # Where available (POSIX only), block until a signal arrives rather than
+    # polling. The default SIGINT handler raises KeyboardInterrupt out of
+    # `signal.pause`. Elsewhere, fall back to sleeping in a loop.
     while True:
-      time.sleep(1)
+      if hasattr(signal, 'pause'):
+        signal.pause()
+      else:
+        time.sleep(1)
   except KeyboardInterrupt:
     interaction.stop()
 
-  print 'Interaction stopped.'
+  print('Interaction stopped.')
 
 
 def console_entry_point():
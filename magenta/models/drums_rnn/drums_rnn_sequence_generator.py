@@ -16,9 +16,102 @@
 from functools import partial
 
 # internal imports
-from magenta.models.drums_rnn import drums_rnn_model
+import numpy as np
 
+from magenta.models.drums_rnn import drums_rnn_model
 import magenta.music as mm
+from magenta.music import sequences_lib
+
+# Generation arguments accepted in GeneratorOptions, and the field of each
+# argument's value to read.
+_ARG_VALUE_FIELDS = (
+    ('temperature', 'float_value'),
+    ('beam_size', 'int_value'),
+    ('branch_factor', 'int_value'),
+    ('steps_per_iteration', 'int_value'),
+)
+
+
+def _notes_to_soa(sequence, start_time=None, end_time=None):
+  """Returns aligned numpy arrays of the note attributes in a NoteSequence.
+
+  If a time range is given, notes are restricted to it the same way
+  `mm.extract_subsequence` does, without copying the NoteSequence: notes
+  starting outside the range are dropped and end times are truncated to
+  `end_time`.
+
+  Args:
+    sequence: The NoteSequence whose notes to extract.
+    start_time: Optional float time in seconds; notes starting before it are
+        dropped.
+    end_time: Optional float time in seconds; notes starting on or after it
+        are dropped. Must be given if `start_time` is given.
+
+  Returns:
+    start_times: A 1-D float numpy array of note start times in seconds.
+    end_times: A 1-D float numpy array of note end times in seconds.
+    pitches: A 1-D integer numpy array of note pitches.
+    drum_onsets: A 1-D boolean numpy array that is True for drum notes with
+        non-zero velocity.
+  """
+  values = np.array(
+      [(note.start_time, note.end_time, note.pitch,
+        note.is_drum and note.velocity > 0)
+       for note in sequence.notes],
+      dtype=np.float64).reshape(-1, 4)
+  if start_time is not None:
+    in_range = (values[:, 0] >= start_time) & (values[:, 0] < end_time)
+    values = values[in_range]
+    values[:, 1] = np.minimum(values[:, 1], end_time)
+  return (values[:, 0], values[:, 1], values[:, 2].astype(np.int32),
+          values[:, 3].astype(bool))
+
+
+def _extract_drum_track_from_soa(sequence, start_times, end_times, pitches,
+                                 drum_onsets, steps_per_quarter,
+                                 search_start_step):
+  """Extracts a drum track from note arrays without quantizing a NoteSequence.
+
+  Produces the same result as `mm.quantize_note_sequence` followed by
+  `mm.extract_drum_tracks` with `min_bars=0` and `gap_bars=float('inf')`, for
+  sequences that `sequences_lib.simple_quantization_steps_per_bar` accepts.
+
+  Args:
+    sequence: The unquantized NoteSequence the note arrays were taken from.
+    start_times: A 1-D float numpy array of note start times in seconds.
+    end_times: A 1-D float numpy array of note end times in seconds.
+    pitches: A 1-D integer numpy array of note pitches.
+    drum_onsets: A 1-D boolean numpy array that is True for drum notes with
+        non-zero velocity.
+    steps_per_quarter: The number of quantized steps per quarter note.
+    search_start_step: The step at which to start searching for drum onsets.
+
+  Returns:
+    A list containing the extracted DrumTrack, or an empty list if there are no
+    drum onsets. Returns None if `sequence` must go through
+    `mm.quantize_note_sequence` instead, either because its timing is not
+    simple or because a note time quantizes to a negative step.
+  """
+  steps_per_bar = sequences_lib.simple_quantization_steps_per_bar(
+      sequence, steps_per_quarter)
+  if steps_per_bar is None:
+    return None
+
+  qpm = (sequence.tempos[0].qpm if sequence.tempos
+         else mm.DEFAULT_QUARTERS_PER_MINUTE)
+  steps_per_second = sequences_lib.steps_per_quarter_to_steps_per_second(
+      steps_per_quarter, qpm)
+  start_steps = sequences_lib.quantize_to_step(start_times, steps_per_second)
+  end_steps = sequences_lib.quantize_to_step(end_times, steps_per_second)
+  if (start_steps < 0).any() or (end_steps < 0).any():
+    return None
+
+  drums = mm.DrumTrack()
+  drums.from_step_array(
+      start_steps[drum_onsets], pitches[drum_onsets],
+      search_start_step=search_start_step, steps_per_bar=steps_per_bar,
+      steps_per_quarter=steps_per_quarter)
+  return [drums] if drums else []
 
 
 class DrumsRnnSequenceGenerator(mm.BaseSequenceGenerator):
@@ -58,15 +151,16 @@ class DrumsRnnSequenceGenerator(mm.BaseSequenceGenerator):
     generate_section = generator_options.generate_sections[0]
     if generator_options.input_sections:
       input_section = generator_options.input_sections[0]
-      primer_sequence = mm.extract_subsequence(
+      start_times, end_times, pitches, drum_onsets = _notes_to_soa(
           input_sequence, input_section.start_time, input_section.end_time)
       input_start_step = self.seconds_to_steps(input_section.start_time, qpm)
     else:
-      primer_sequence = input_sequence
+      input_section = None
+      start_times, end_times, pitches, drum_onsets = _notes_to_soa(
+          input_sequence)
       input_start_step = 0
 
-    last_end_time = (max(n.end_time for n in primer_sequence.notes)
-                     if primer_sequence.notes else 0)
+    last_end_time = float(end_times.max()) if end_times.size else 0.0
     if last_end_time >= generate_section.start_time:
       raise mm.SequenceGeneratorException(
           'Got GenerateSection request for section that is before or equal to '
@@ -74,14 +168,28 @@ class DrumsRnnSequenceGenerator(mm.BaseSequenceGenerator):
           'Requested start time: %s, Final note end time: %s' %
           (generate_section.start_time, last_end_time))
 
-    # Quantize the priming sequence.
-    quantized_sequence = mm.quantize_note_sequence(
-        primer_sequence, self.steps_per_quarter)
-    # Setting gap_bars to infinite ensures that the entire input will be used.
-    extracted_drum_tracks, _ = mm.extract_drum_tracks(
-        quantized_sequence, search_start_step=input_start_step, min_bars=0,
-        gap_bars=float('inf'))
-    assert len(extracted_drum_tracks) <= 1
+    if not start_times.size:
+      # An empty primer contains no drum tracks, so skip quantization and
+      # extraction entirely.
+      extracted_drum_tracks = []
+    else:
+      extracted_drum_tracks = _extract_drum_track_from_soa(
+          input_sequence, start_times, end_times, pitches, drum_onsets,
+          self.steps_per_quarter, input_start_step)
+    if extracted_drum_tracks is None:
+      primer_sequence = (
+          input_sequence if input_section is None else
+          mm.extract_subsequence(input_sequence, input_section.start_time,
+                                 input_section.end_time))
+      # Quantize the priming sequence.
+      quantized_sequence = mm.quantize_note_sequence(
+          primer_sequence, self.steps_per_quarter)
+      # Setting gap_bars to infinite ensures that the entire input will be
+      # used.
+      extracted_drum_tracks, _ = mm.extract_drum_tracks(
+          quantized_sequence, search_start_step=input_start_step, min_bars=0,
+          gap_bars=float('inf'))
+      assert len(extracted_drum_tracks) <= 1
 
     start_step = self.seconds_to_steps(
         generate_section.start_time, qpm)
@@ -100,14 +208,8 @@ class DrumsRnnSequenceGenerator(mm.BaseSequenceGenerator):
     drums.set_length(start_step - drums.start_step)
 
     # Extract generation arguments from generator options.
-    arg_types = {
-        'temperature': lambda arg: arg.float_value,
-        'beam_size': lambda arg: arg.int_value,
-        'branch_factor': lambda arg: arg.int_value,
-        'steps_per_iteration': lambda arg: arg.int_value
-    }
-    args = dict((name, value_fn(generator_options.args[name]))
-                for name, value_fn in arg_types.items()
+    args = dict((name, getattr(generator_options.args[name], value_field))
+                for name, value_field in _ARG_VALUE_FIELDS
                 if name in generator_options.args)
 
     generated_drums = self._model.generate_drum_track(
@@ -121,12 +223,16 @@ def get_generator_map():
   """Returns a map from the generator ID to its SequenceGenerator class.
 
   Binds the `config` argument so that the constructor matches the
-  BaseSequenceGenerator class.
+  BaseSequenceGenerator class. The DrumsRnnModel for a config is only
+  constructed when a generator is created for it.
 
   Returns:
     Map from the generator ID to its SequenceGenerator class with a bound
     `config` argument.
   """
-  return {key: partial(DrumsRnnSequenceGenerator,
-                       drums_rnn_model.DrumsRnnModel(config), config.details)
+  def create_sequence_generator(config, **kwargs):
+    return DrumsRnnSequenceGenerator(
+        drums_rnn_model.DrumsRnnModel(config), config.details, **kwargs)
+
+  return {key: partial(create_sequence_generator, config)
           for (key, config) in drums_rnn_model.default_configs.items()}
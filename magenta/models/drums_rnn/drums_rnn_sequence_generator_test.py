@@ -0,0 +1,121 @@
+# Copyright 2016 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for drums_rnn_sequence_generator."""
+
+# internal imports
+import tensorflow as tf
+
+from magenta.common import testing_lib as common_testing_lib
+from magenta.models.drums_rnn import drums_rnn_sequence_generator
+import magenta.music as mm
+from magenta.music import testing_lib
+from magenta.protobuf import music_pb2
+
+
+class DrumsRnnSequenceGeneratorTest(tf.test.TestCase):
+
+  def setUp(self):
+    self.steps_per_quarter = 4
+    self.note_sequence = common_testing_lib.parse_test_proto(
+        music_pb2.NoteSequence,
+        """
+        time_signatures: {
+          numerator: 3
+          denominator: 4
+        }
+        tempos: {
+          qpm: 60
+        }
+        """)
+    testing_lib.add_track_to_sequence(
+        self.note_sequence, 0,
+        [(36, 100, 0.0, 0.5), (38, 100, 1.0, 1.5), (42, 100, 3.0, 3.2),
+         (36, 0, 3.3, 3.5), (46, 80, 4.12, 4.3), (38, 100, 4.13, 5.0),
+         (42, 90, 7.5, 9.5), (36, 100, 9.0, 9.1)],
+        is_drum=True)
+    testing_lib.add_track_to_sequence(
+        self.note_sequence, 1, [(60, 100, 2.9, 4.0), (62, 100, 5.0, 6.0)])
+
+  def _extract_drum_tracks_from_quantized_sequence(self, start_time, end_time):
+    quantized_sequence = mm.quantize_note_sequence(
+        mm.extract_subsequence(self.note_sequence, start_time, end_time),
+        self.steps_per_quarter)
+    drum_tracks, _ = mm.extract_drum_tracks(
+        quantized_sequence,
+        search_start_step=int(start_time * self.steps_per_quarter),
+        min_bars=0, gap_bars=float('inf'))
+    return drum_tracks
+
+  def _extract_drum_tracks_from_soa(self, start_time, end_time):
+    start_times, end_times, pitches, drum_onsets = (
+        drums_rnn_sequence_generator._notes_to_soa(
+            self.note_sequence, start_time, end_time))
+    return drums_rnn_sequence_generator._extract_drum_track_from_soa(
+        self.note_sequence, start_times, end_times, pitches, drum_onsets,
+        self.steps_per_quarter, int(start_time * self.steps_per_quarter))
+
+  def testNotesToSoa(self):
+    start_times, end_times, pitches, drum_onsets = (
+        drums_rnn_sequence_generator._notes_to_soa(self.note_sequence))
+    self.assertEqual([note.start_time for note in self.note_sequence.notes],
+                     start_times.tolist())
+    self.assertEqual([note.end_time for note in self.note_sequence.notes],
+                     end_times.tolist())
+    self.assertEqual([note.pitch for note in self.note_sequence.notes],
+                     pitches.tolist())
+    self.assertEqual([True, True, True, False, True, True, True, True,
+                      False, False],
+                     drum_onsets.tolist())
+
+  def testNotesToSoaMatchesExtractSubsequence(self):
+    subsequence = mm.extract_subsequence(self.note_sequence, 3.0, 9.0)
+    expected = drums_rnn_sequence_generator._notes_to_soa(subsequence)
+    soa = drums_rnn_sequence_generator._notes_to_soa(
+        self.note_sequence, 3.0, 9.0)
+    self.assertEqual(6, len(soa[0]))
+    for expected_array, array in zip(expected, soa):
+      self.assertEqual(expected_array.dtype, array.dtype)
+      self.assertEqual(expected_array.tolist(), array.tolist())
+
+  def testExtractDrumTrackFromSoaMatchesQuantizedSequence(self):
+    expected = self._extract_drum_tracks_from_quantized_sequence(3.0, 9.0)
+    drum_tracks = self._extract_drum_tracks_from_soa(3.0, 9.0)
+    self.assertEqual(1, len(drum_tracks))
+    self.assertEqual(expected, drum_tracks)
+    self.assertEqual(12, drum_tracks[0].start_step)
+    self.assertEqual(12, drum_tracks[0].steps_per_bar)
+
+    self.note_sequence.time_signatures[0].numerator = 6
+    self.note_sequence.time_signatures[0].denominator = 8
+    expected = self._extract_drum_tracks_from_quantized_sequence(3.0, 9.0)
+    drum_tracks = self._extract_drum_tracks_from_soa(3.0, 9.0)
+    self.assertEqual(expected, drum_tracks)
+    self.assertEqual(12, drum_tracks[0].steps_per_bar)
+
+  def testExtractDrumTrackFromSoaNoDrums(self):
+    self.assertEqual(
+        [], self._extract_drum_tracks_from_quantized_sequence(5.0, 7.0))
+    self.assertEqual([], self._extract_drum_tracks_from_soa(5.0, 7.0))
+
+  def testExtractDrumTrackFromSoaRequiresFullQuantization(self):
+    self.note_sequence.tempos.add(qpm=120, time=2.0)
+    self.assertIsNone(self._extract_drum_tracks_from_soa(3.0, 9.0))
+
+    del self.note_sequence.tempos[1:]
+    testing_lib.add_chords_to_sequence(self.note_sequence, [('C', -1.0)])
+    self.assertIsNone(self._extract_drum_tracks_from_soa(3.0, 9.0))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -121,12 +121,17 @@ def get_generator_map():
   """Returns a map from the generator ID to its SequenceGenerator class.
 
   Binds the `config` argument so that the constructor matches the
-  BaseSequenceGenerator class.
+  BaseSequenceGenerator class. The MelodyRnnModel for a config is only
+  constructed when a generator is created for it, so generators never share a
+  model or its TF session.
 
   Returns:
     Map from the generator ID to its SequenceGenerator class with a bound
     `config` argument.
   """
-  return {key: partial(MelodyRnnSequenceGenerator,
-                       melody_rnn_model.MelodyRnnModel(config), config.details)
+  def create_sequence_generator(config, **kwargs):
+    return MelodyRnnSequenceGenerator(
+        melody_rnn_model.MelodyRnnModel(config), config.details, **kwargs)
+
+  return {key: partial(create_sequence_generator, config)
           for (key, config) in melody_rnn_model.default_configs.items()}
@@ -54,9 +54,66 @@ class EventSequenceRnnModel(mm.BaseModel):
     self._config.hparams.dropout_keep_prob = 1.0
     self._config.hparams.batch_size = 1
 
+    # Generation tensors looked up from the graph of `_generation_session`,
+    # and the evaluated initial RNN state of that graph.
+    self._generation_tensors = None
+    self._generation_session = None
+    self._zero_state = None
+
   def _build_graph_for_generation(self):
     return events_rnn_graph.build_graph('generate', self._config)
 
+  def _get_generation_tensors(self):
+    """Returns the graph tensors used for generation.
+
+    The tensors are looked up from the graph collections once per session,
+    rather than once per generated step.
+
+    Returns:
+      A tuple (inputs, initial_state, final_state, softmax, temperature) of
+      graph tensors. `temperature` is None if the graph has no temperature
+      placeholder.
+    """
+    if self._generation_session is not self._session:
+      graph = self._session.graph
+      temperature = graph.get_collection('temperature')
+      self._generation_tensors = (
+          graph.get_collection('inputs')[0],
+          graph.get_collection('initial_state')[0],
+          graph.get_collection('final_state')[0],
+          graph.get_collection('softmax')[0],
+          # For backwards compatibility, the temperature placeholder may not
+          # exist in the graph.
+          temperature[0] if temperature else None)
+      self._generation_session = self._session
+      self._zero_state = None
+    return self._generation_tensors
+
+  def close(self):
+    """Closes the TF session and clears the generation caches.
+
+    The caches refer to the session and its graph, so they are cleared to let
+    both be freed.
+    """
+    self._generation_tensors = None
+    self._generation_session = None
+    self._zero_state = None
+    super(EventSequenceRnnModel, self).close()
+
+  def _get_zero_state(self):
+    """Returns the initial RNN state as a numpy array.
+
+    The initial state does not depend on any input, so it is evaluated once per
+    session rather than once per generated event sequence.
+
+    Returns:
+      A numpy array containing the initial RNN state for a single batch.
+    """
+    graph_initial_state = self._get_generation_tensors()[1]
+    if self._zero_state is None:
+      self._zero_state = self._session.run(graph_initial_state)
+    return self._zero_state
+
   def _generate_step_for_batch(self, event_sequences, inputs, initial_state,
                                temperature):
     """Extends a batch of event sequences by a single step each.
@@ -82,17 +139,14 @@ class EventSequenceRnnModel(mm.BaseModel):
     """
     assert len(event_sequences) == self._config.hparams.batch_size
 
-    graph_inputs = self._session.graph.get_collection('inputs')[0]
-    graph_initial_state = self._session.graph.get_collection('initial_state')[0]
-    graph_final_state = self._session.graph.get_collection('final_state')[0]
-    graph_softmax = self._session.graph.get_collection('softmax')[0]
-    graph_temperature = self._session.graph.get_collection('temperature')
+    (graph_inputs, graph_initial_state, graph_final_state, graph_softmax,
+     graph_temperature) = self._get_generation_tensors()
 
     feed_dict = {graph_inputs: inputs, graph_initial_state: initial_state}
     # For backwards compatibility, we only try to pass temperature if the
     # placeholder exists in the graph.
-    if graph_temperature:
-      feed_dict[graph_temperature[0]] = temperature
+    if graph_temperature is not None:
+      feed_dict[graph_temperature] = temperature
     final_state, softmax = self._session.run(
         [graph_final_state, graph_softmax], feed_dict)
     indices = self._config.encoder_decoder.extend_event_sequences(
@@ -273,7 +327,6 @@ class EventSequenceRnnModel(mm.BaseModel):
       The highest-likelihood event sequence as computed by the beam search.
     """
     event_sequences = [copy.deepcopy(events) for _ in range(beam_size)]
-    graph_initial_state = self._session.graph.get_collection('initial_state')[0]
     loglik = np.zeros(beam_size)
 
     # Choose the number of steps for the first iteration such that subsequent
@@ -287,8 +340,7 @@ class EventSequenceRnnModel(mm.BaseModel):
     else:
       inputs = self._config.encoder_decoder.get_inputs_batch(
           event_sequences, full_length=True)
-    initial_state = np.tile(
-        self._session.run(graph_initial_state), (beam_size, 1))
+    initial_state = np.tile(self._get_zero_state(), (beam_size, 1))
     event_sequences, final_state, loglik = self._generate_branches(
         event_sequences, loglik, branch_factor, first_iteration_num_steps,
         inputs, initial_state, temperature)
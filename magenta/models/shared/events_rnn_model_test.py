@@ -0,0 +1,71 @@
+# Copyright 2016 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for events_rnn_model."""
+
+# internal imports
+import tensorflow as tf
+import magenta
+
+from magenta.models.shared import events_rnn_model
+
+
+class EventSequenceRnnModelTest(tf.test.TestCase):
+
+  def setUp(self):
+    self.config = events_rnn_model.EventSequenceRnnConfig(
+        None,
+        magenta.music.OneHotEventSequenceEncoderDecoder(
+            magenta.music.testing_lib.TrivialOneHotEncoding(12)),
+        magenta.common.HParams(
+            batch_size=128,
+            rnn_layer_sizes=[128, 128],
+            dropout_keep_prob=0.5,
+            skip_first_n_losses=0,
+            clip_norm=5,
+            initial_learning_rate=0.01,
+            decay_steps=1000,
+            decay_rate=0.85))
+    self.model = events_rnn_model.EventSequenceRnnModel(self.config)
+
+  def _new_session(self):
+    return tf.Session(graph=self.model._build_graph_for_generation())
+
+  def testGenerationCachesResetWhenSessionChanges(self):
+    self.model._session = self._new_session()
+    tensors = self.model._get_generation_tensors()
+    self.assertIs(tensors, self.model._get_generation_tensors())
+    zero_state = self.model._get_zero_state()
+    self.assertIs(zero_state, self.model._get_zero_state())
+    self.model.close()
+
+    self.model._session = self._new_session()
+    new_tensors = self.model._get_generation_tensors()
+    self.assertIsNot(tensors, new_tensors)
+    self.assertIs(self.model._session.graph, new_tensors[0].graph)
+    self.assertIsNot(zero_state, self.model._get_zero_state())
+    self.model.close()
+
+  def testCloseClearsGenerationCaches(self):
+    self.model._session = self._new_session()
+    self.model._get_zero_state()
+    self.model.close()
+
+    self.assertIsNone(self.model._session)
+    self.assertIsNone(self.model._generation_tensors)
+    self.assertIsNone(self.model._generation_session)
+    self.assertIsNone(self.model._zero_state)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -26,6 +26,8 @@ import operator
 
 # internal imports
 
+import numpy as np
+
 from magenta.music import constants
 from magenta.music import events_lib
 from magenta.music import midi_io
@@ -221,6 +223,56 @@ class DrumTrack(events_lib.SimpleEventSequence):
       length += -len(self) % steps_per_bar
     self.set_length(length)
 
+  def from_step_array(self,
+                      steps,
+                      pitches,
+                      search_start_step=0,
+                      steps_per_bar=DEFAULT_STEPS_PER_BAR,
+                      steps_per_quarter=DEFAULT_STEPS_PER_QUARTER):
+    """Populate self with drums from aligned arrays of quantized drum notes.
+
+    This is equivalent to `from_quantized_sequence` with infinite `gap_bars`,
+    for drum notes whose quantized start steps have already been computed. The
+    caller is responsible for filtering out non-drum and zero-velocity notes.
+
+    Args:
+      steps: A 1-D integer numpy array of quantized drum note start steps.
+      pitches: A 1-D integer numpy array of drum "pitches", aligned with
+          `steps`.
+      search_start_step: Ignore drum notes that start before this time step.
+          Assumed to be the beginning of a bar.
+      steps_per_bar: The number of steps in a bar.
+      steps_per_quarter: The number of steps in a quarter note.
+    """
+    self._reset()
+    self._steps_per_bar = steps_per_bar
+    self._steps_per_quarter = steps_per_quarter
+
+    in_range = steps >= search_start_step
+    steps = steps[in_range]
+    pitches = pitches[in_range]
+    if not steps.size:
+      # If there are no drum events, don't set `_start_step` and `_end_step`.
+      return
+
+    first_step = int(steps.min())
+    track_start_step = (
+        first_step - (first_step - search_start_step) % steps_per_bar)
+
+    # Group all drum notes that start at the same step.
+    order = np.argsort(steps, kind='mergesort')
+    indices = steps[order] - track_start_step
+    pitches = pitches[order]
+    unique_indices, group_starts = np.unique(indices, return_index=True)
+
+    self._events = [self._pad_event] * (int(unique_indices[-1]) + 1)
+    for index, group in zip(unique_indices.tolist(),
+                            np.split(pitches, group_starts[1:])):
+      self._events[index] = frozenset(group.tolist())
+
+    self._start_step = track_start_step
+    self._end_step = track_start_step + len(self)
+
   def to_sequence(self,
                   velocity=100,
                   instrument=9,
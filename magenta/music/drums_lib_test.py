@@ -14,6 +14,7 @@
 """Tests for drums_lib."""
 
 # internal imports
+import numpy as np
 import tensorflow as tf
 
 from magenta.common import testing_lib as common_testing_lib
@@ -143,6 +144,39 @@ class DrumsLibTest(tf.test.TestCase):
     self.assertEqual(34, drums.start_step)
     self.assertEqual(38, drums.end_step)
 
+  def testFromStepArray(self):
+    drums = drums_lib.DrumTrack()
+    drums.from_step_array(np.array([16, 0, 1, 10, 19, 16]),
+                          np.array([60, 12, 11, 40, 52, 55]))
+    expected = ([DRUMS(12), DRUMS(11), NO_DRUMS, NO_DRUMS, NO_DRUMS, NO_DRUMS,
+                 NO_DRUMS, NO_DRUMS, NO_DRUMS, NO_DRUMS, DRUMS(40), NO_DRUMS,
+                 NO_DRUMS, NO_DRUMS, NO_DRUMS, NO_DRUMS, DRUMS(55, 60),
+                 NO_DRUMS, NO_DRUMS, DRUMS(52)])
+    self.assertEqual(expected, list(drums))
+    self.assertEqual(16, drums.steps_per_bar)
+
+  def testFromStepArrayMatchesQuantizedSequence(self):
+    testing_lib.add_track_to_sequence(
+        self.note_sequence, 0,
+        [(12, 100, 1, 2), (11, 100, 2.25, 2.5), (13, 100, 3.25, 3.75),
+         (14, 100, 8.75, 9), (15, 100, 9.25, 10.75)],
+        is_drum=True)
+    quantized_sequence = sequences_lib.quantize_note_sequence(
+        self.note_sequence, self.steps_per_quarter)
+    expected_drums = drums_lib.DrumTrack()
+    expected_drums.from_quantized_sequence(
+        quantized_sequence, search_start_step=18, gap_bars=float('inf'))
+
+    drums = drums_lib.DrumTrack()
+    drums.from_step_array(
+        np.array([note.quantized_start_step
+                  for note in quantized_sequence.notes]),
+        np.array([note.pitch for note in quantized_sequence.notes]),
+        search_start_step=18)
+    self.assertEqual(expected_drums, drums)
+    self.assertEqual(34, drums.start_step)
+    self.assertEqual(38, drums.end_step)
+
   def testSetLength(self):
     events = [DRUMS(60)]
     drums = drums_lib.DrumTrack(events, start_step=9)
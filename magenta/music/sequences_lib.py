@@ -16,6 +16,7 @@
 import copy
 
 # internal imports
+import numpy as np
 
 from magenta.music import constants
 from magenta.protobuf import music_pb2
@@ -128,12 +129,91 @@ def steps_per_bar_in_quantized_sequence(note_sequence):
   """
   assert_is_quantized_sequence(note_sequence)
 
-  quarters_per_beat = 4.0 / note_sequence.time_signatures[0].denominator
-  quarters_per_bar = (quarters_per_beat *
-                      note_sequence.time_signatures[0].numerator)
-  steps_per_bar_float = (note_sequence.quantization_info.steps_per_quarter *
-                         quarters_per_bar)
-  return steps_per_bar_float
+  return _steps_per_bar(note_sequence.time_signatures[0],
+                        note_sequence.quantization_info.steps_per_quarter)
+
+
+def _steps_per_bar(time_signature, steps_per_quarter):
+  """Calculates steps per bar for a TimeSignature as a floating point number."""
+  quarters_per_beat = 4.0 / time_signature.denominator
+  quarters_per_bar = quarters_per_beat * time_signature.numerator
+  return steps_per_quarter * quarters_per_bar
+
+
+def steps_per_quarter_to_steps_per_second(steps_per_quarter, qpm):
+  """Calculates steps per second given steps per quarter and a qpm."""
+  return steps_per_quarter * qpm / 60.0
+
+
+def quantize_to_step(unquantized_seconds, steps_per_second):
+  """Quantizes seconds to steps, taking into account `QUANTIZE_CUTOFF`.
+
+  Args:
+    unquantized_seconds: Seconds to quantize, either a float or a numpy array
+        of floats.
+    steps_per_second: Quantizing resolution.
+
+  Returns:
+    The input value quantized to steps, as an int if `unquantized_seconds` is a
+    float and as an integer numpy array if it is a numpy array. Both round
+    towards zero, so negative times quantize the same way either way.
+  """
+  unquantized_steps = (unquantized_seconds * steps_per_second +
+                       (1 - QUANTIZE_CUTOFF))
+  if isinstance(unquantized_steps, np.ndarray):
+    return unquantized_steps.astype(np.int64)
+  return int(unquantized_steps)
+
+
+def simple_quantization_steps_per_bar(note_sequence, steps_per_quarter):
+  """Returns integer steps per bar if a NoteSequence has simple timing.
+
+  A NoteSequence has simple timing if it has at most one tempo and one time
+  signature, both at time 0, a time signature whose bars divide into a whole
+  number of steps, and no text annotation that quantizes to a negative step.
+  Such a sequence can be quantized by applying `quantize_to_step` to its note
+  times directly; `quantize_note_sequence` would only raise for it if one of
+  those note times quantizes to a negative step.
+
+  Args:
+    note_sequence: An unquantized music_pb2.NoteSequence protocol buffer.
+    steps_per_quarter: Each quarter note of music will be divided into this
+        many quantized time steps.
+
+  Returns:
+    The integer number of steps per bar, or None if `note_sequence` does not
+    have simple timing and must go through `quantize_note_sequence`.
+  """
+  if len(note_sequence.tempos) > 1 or len(note_sequence.time_signatures) > 1:
+    return None
+
+  if note_sequence.tempos:
+    if note_sequence.tempos[0].time != 0:
+      return None
+    qpm = note_sequence.tempos[0].qpm
+  else:
+    qpm = constants.DEFAULT_QUARTERS_PER_MINUTE
+
+  if note_sequence.time_signatures:
+    time_signature = note_sequence.time_signatures[0]
+    if time_signature.time != 0:
+      return None
+  else:
+    time_signature = music_pb2.NoteSequence.TimeSignature(
+        numerator=4, denominator=4)
+  if not _is_power_of_2(time_signature.denominator):
+    return None
+  steps_per_bar = _steps_per_bar(time_signature, steps_per_quarter)
+  if steps_per_bar % 1 != 0:
+    return None
+
+  steps_per_second = steps_per_quarter_to_steps_per_second(
+      steps_per_quarter, qpm)
+  for annotation in note_sequence.text_annotations:
+    if quantize_to_step(annotation.time, steps_per_second) < 0:
+      return None
+
+  return int(steps_per_bar)
 
 
 def quantize_note_sequence(note_sequence, steps_per_quarter):
@@ -234,16 +314,18 @@ def quantize_note_sequence(note_sequence, steps_per_quarter):
     tempo.time = 0
 
   # Compute quantization steps per second.
-  steps_per_second = steps_per_quarter * qns.tempos[0].qpm / 60.0
-
-  quantize = lambda x: int(x + (1 - QUANTIZE_CUTOFF))
+  steps_per_second = steps_per_quarter_to_steps_per_second(
+      steps_per_quarter, qns.tempos[0].qpm)
 
-  qns.total_quantized_steps = quantize(qns.total_time * steps_per_second)
+  qns.total_quantized_steps = quantize_to_step(
+      qns.total_time, steps_per_second)
 
   for note in qns.notes:
     # Quantize the start and end times of the note.
-    note.quantized_start_step = quantize(note.start_time * steps_per_second)
-    note.quantized_end_step = quantize(note.end_time * steps_per_second)
+    note.quantized_start_step = quantize_to_step(
+        note.start_time, steps_per_second)
+    note.quantized_end_step = quantize_to_step(
+        note.end_time, steps_per_second)
     if note.quantized_end_step == note.quantized_start_step:
       note.quantized_end_step += 1
 
@@ -260,7 +342,8 @@ def quantize_note_sequence(note_sequence, steps_per_quarter):
   # Also quantize chord symbol annotations.
   for annotation in qns.text_annotations:
     # Quantize the chord time, disallowing negative time.
-    annotation.quantized_step = quantize(annotation.time * steps_per_second)
+    annotation.quantized_step = quantize_to_step(
+        annotation.time, steps_per_second)
     if annotation.quantized_step < 0:
       raise NegativeTimeException(
           'Got negative chord time: step = %s' % annotation.quantized_step)
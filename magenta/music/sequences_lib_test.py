@@ -16,6 +16,7 @@
 import copy
 
 # internal imports
+import numpy as np
 import tensorflow as tf
 
 from magenta.common import testing_lib as common_testing_lib
@@ -264,6 +265,70 @@ class SequencesLibTest(tf.test.TestCase):
     self.assertEqual(12.0,
                      sequences_lib.steps_per_bar_in_quantized_sequence(qns))
 
+  def testQuantizeToStep(self):
+    self.assertEqual(
+        [0, 0, 1, 8, 0, 0],
+        [sequences_lib.quantize_to_step(seconds, 4.0)
+         for seconds in (0.0, 0.12, 0.13, 2.0, -0.12, -0.2)])
+    quantized_steps = sequences_lib.quantize_to_step(
+        np.array([0.0, 0.12, 0.13, 2.0, -0.12, -0.2]), 4.0)
+    self.assertEqual(np.int64, quantized_steps.dtype)
+    self.assertEqual([0, 0, 1, 8, 0, 0], quantized_steps.tolist())
+
+  def testSimpleQuantizationStepsPerBar(self):
+    self.assertEqual(16, sequences_lib.simple_quantization_steps_per_bar(
+        self.note_sequence, self.steps_per_quarter))
+
+    self.note_sequence.time_signatures[0].numerator = 3
+    self.assertEqual(12, sequences_lib.simple_quantization_steps_per_bar(
+        self.note_sequence, self.steps_per_quarter))
+
+    self.note_sequence.time_signatures[0].numerator = 6
+    self.note_sequence.time_signatures[0].denominator = 8
+    self.assertEqual(12, sequences_lib.simple_quantization_steps_per_bar(
+        self.note_sequence, self.steps_per_quarter))
+
+    del self.note_sequence.time_signatures[:]
+    del self.note_sequence.tempos[:]
+    self.assertEqual(16, sequences_lib.simple_quantization_steps_per_bar(
+        self.note_sequence, self.steps_per_quarter))
+
+  def testSimpleQuantizationStepsPerBar_TempoChange(self):
+    self.note_sequence.tempos.add(qpm=120, time=2)
+    self.assertIsNone(sequences_lib.simple_quantization_steps_per_bar(
+        self.note_sequence, self.steps_per_quarter))
+
+  def testSimpleQuantizationStepsPerBar_TempoNotAtZero(self):
+    self.note_sequence.tempos[0].time = 1
+    self.assertIsNone(sequences_lib.simple_quantization_steps_per_bar(
+        self.note_sequence, self.steps_per_quarter))
+
+  def testSimpleQuantizationStepsPerBar_TimeSignatureNotAtZero(self):
+    self.note_sequence.time_signatures[0].time = 1
+    self.assertIsNone(sequences_lib.simple_quantization_steps_per_bar(
+        self.note_sequence, self.steps_per_quarter))
+
+  def testSimpleQuantizationStepsPerBar_BadTimeSignature(self):
+    self.note_sequence.time_signatures[0].numerator = 3
+    self.note_sequence.time_signatures[0].denominator = 6
+    self.assertIsNone(sequences_lib.simple_quantization_steps_per_bar(
+        self.note_sequence, self.steps_per_quarter))
+
+    # A 1/32 bar is half a step long at 4 steps per quarter.
+    self.note_sequence.time_signatures[0].numerator = 1
+    self.note_sequence.time_signatures[0].denominator = 32
+    self.assertIsNone(sequences_lib.simple_quantization_steps_per_bar(
+        self.note_sequence, self.steps_per_quarter))
+
+  def testSimpleQuantizationStepsPerBar_NegativeChordTime(self):
+    testing_lib.add_chords_to_sequence(
+        self.note_sequence, [('C', 0.0), ('G7', -0.5)])
+    self.assertIsNone(sequences_lib.simple_quantization_steps_per_bar(
+        self.note_sequence, self.steps_per_quarter))
+    with self.assertRaises(sequences_lib.NegativeTimeException):
+      sequences_lib.quantize_note_sequence(
+          self.note_sequence, self.steps_per_quarter)
+
 
 if __name__ == '__main__':
   tf.test.main()